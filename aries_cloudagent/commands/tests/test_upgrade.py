@@ -1,10 +1,20 @@
 import asyncio
+import pytest
 
 from asynctest import mock as async_mock, TestCase as AsyncTestCase
 
+from ...askar.profile import AskarProfileManager
+from ...config.injection_context import InjectionContext
 from ...core.in_memory import InMemoryProfile
 from ...connections.models.conn_record import ConnRecord
+from ...protocols.issue_credential.v1_0.models.credential_exchange import (
+    V10CredentialExchange,
+)
+from ...protocols.present_proof.v1_0.models.presentation_exchange import (
+    V10PresentationExchange,
+)
 from ...storage.base import BaseStorage
+from ...storage.error import StorageError
 from ...storage.record import StorageRecord
 from ...version import __version__
 
@@ -12,6 +22,19 @@ from .. import upgrade as test_module
 from ..upgrade import UpgradeError
 
 
+PIPELINE_UPGRADE_CONFIG = {
+    "v0.7.2": {
+        "resave_records": {
+            "base_record_path": [
+                "aries_cloudagent.connections.models.conn_record.ConnRecord"
+            ]
+        },
+        "update_existing_records": True,
+    },
+    "fix_issue_rev_reg": {"fix_issue_rev_reg_records": True},
+}
+
+
 class TestUpgrade(AsyncTestCase):
     async def setUp(self):
         self.session = InMemoryProfile.test_session()
@@ -120,6 +143,43 @@ class TestUpgrade(AsyncTestCase):
                     "upgrade.from_version": "v0.7.2",
                 }
             )
+        version_storage_record = await self.storage.find_record(
+            type_filter="acapy_version", tag_query={}
+        )
+        assert version_storage_record.value == f"v{__version__}"
+
+    async def test_upgrade_skips_update_existing_records_stub(self):
+        with async_mock.patch.object(
+            test_module,
+            "wallet_config",
+            async_mock.CoroutineMock(
+                return_value=(
+                    self.profile,
+                    async_mock.CoroutineMock(did="public DID", verkey="verkey"),
+                )
+            ),
+        ), async_mock.patch.object(
+            test_module.yaml,
+            "safe_load",
+            async_mock.MagicMock(
+                return_value={
+                    "v0.7.2": {"update_existing_records": True},
+                    "fix_issue_rev_reg": {"fix_issue_rev_reg_records": True},
+                }
+            ),
+        ), async_mock.patch.object(
+            test_module, "_run_upgrade_callables", async_mock.CoroutineMock()
+        ) as mock_run_callables:
+            await test_module.upgrade(
+                settings={
+                    "upgrade.from_version": "v0.7.2",
+                }
+            )
+            mock_run_callables.assert_awaited_once_with(self.profile, [])
+        version_storage_record = await self.storage.find_record(
+            type_filter="acapy_version", tag_query={}
+        )
+        assert version_storage_record.value == f"v{__version__}"
 
     async def test_upgrade_callable_named_tag(self):
         version_storage_record = await self.storage.find_record(
@@ -159,6 +219,166 @@ class TestUpgrade(AsyncTestCase):
                 }
             )
 
+    async def test_upgrade_pipeline(self):
+        steps_started = []
+        both_started = asyncio.Event()
+
+        async def _step(name):
+            steps_started.append(name)
+            if len(steps_started) == 2:
+                both_started.set()
+            # Only completes if the other step runs concurrently
+            await asyncio.wait_for(both_started.wait(), 5)
+
+        async def _resave(*args):
+            await _step("resave")
+
+        async def _run_callables(*args):
+            await _step("update")
+
+        with async_mock.patch.object(
+            test_module,
+            "wallet_config",
+            async_mock.CoroutineMock(
+                return_value=(
+                    self.profile,
+                    async_mock.CoroutineMock(did="public DID", verkey="verkey"),
+                )
+            ),
+        ), async_mock.patch.object(
+            test_module.yaml,
+            "safe_load",
+            async_mock.MagicMock(return_value=PIPELINE_UPGRADE_CONFIG),
+        ), async_mock.patch.object(
+            test_module,
+            "_resave_record_types",
+            async_mock.CoroutineMock(side_effect=_resave),
+        ) as mock_resave, async_mock.patch.object(
+            test_module,
+            "_run_upgrade_callables",
+            async_mock.CoroutineMock(side_effect=_run_callables),
+        ) as mock_run_callables:
+            await test_module.upgrade(
+                settings={
+                    "upgrade.from_version": "v0.7.2",
+                    "upgrade.named_tags": ["fix_issue_rev_reg"],
+                    "upgrade.force_upgrade": True,
+                    "upgrade.pipeline": True,
+                }
+            )
+            mock_resave.assert_awaited_once_with(self.profile, [ConnRecord])
+            mock_run_callables.assert_awaited_once_with(
+                self.profile, [test_module.fix_issue_rev_reg_records]
+            )
+        assert sorted(steps_started) == ["resave", "update"]
+
+    async def test_upgrade_pipeline_x_resave_cancels_update(self):
+        update_cancelled = []
+
+        async def _resave(*args):
+            await asyncio.sleep(0)
+            raise test_module.BaseModelError("bad record")
+
+        async def _run_callables(*args):
+            try:
+                await asyncio.Event().wait()
+            except asyncio.CancelledError:
+                update_cancelled.append(True)
+                raise
+
+        with async_mock.patch.object(
+            test_module,
+            "wallet_config",
+            async_mock.CoroutineMock(
+                return_value=(
+                    self.profile,
+                    async_mock.CoroutineMock(did="public DID", verkey="verkey"),
+                )
+            ),
+        ), async_mock.patch.object(
+            test_module.yaml,
+            "safe_load",
+            async_mock.MagicMock(return_value=PIPELINE_UPGRADE_CONFIG),
+        ), async_mock.patch.object(
+            test_module,
+            "_resave_record_types",
+            async_mock.CoroutineMock(side_effect=_resave),
+        ), async_mock.patch.object(
+            test_module,
+            "_run_upgrade_callables",
+            async_mock.CoroutineMock(side_effect=_run_callables),
+        ):
+            with self.assertRaises(UpgradeError):
+                await test_module.upgrade(
+                    settings={
+                        "upgrade.from_version": "v0.7.2",
+                        "upgrade.named_tags": ["fix_issue_rev_reg"],
+                        "upgrade.force_upgrade": True,
+                        "upgrade.pipeline": True,
+                    }
+                )
+        assert update_cancelled
+
+    async def test_upgrade_sequential_x_resave_skips_update(self):
+        with async_mock.patch.object(
+            test_module,
+            "wallet_config",
+            async_mock.CoroutineMock(
+                return_value=(
+                    self.profile,
+                    async_mock.CoroutineMock(did="public DID", verkey="verkey"),
+                )
+            ),
+        ), async_mock.patch.object(
+            test_module.yaml,
+            "safe_load",
+            async_mock.MagicMock(return_value=PIPELINE_UPGRADE_CONFIG),
+        ), async_mock.patch.object(
+            test_module,
+            "_resave_record_types",
+            async_mock.CoroutineMock(
+                side_effect=test_module.BaseModelError("bad record")
+            ),
+        ), async_mock.patch.object(
+            test_module, "_run_upgrade_callables", async_mock.CoroutineMock()
+        ) as mock_run_callables:
+            with self.assertRaises(UpgradeError):
+                await test_module.upgrade(
+                    settings={
+                        "upgrade.from_version": "v0.7.2",
+                        "upgrade.named_tags": ["fix_issue_rev_reg"],
+                        "upgrade.force_upgrade": True,
+                    }
+                )
+            mock_run_callables.assert_not_called()
+
+    async def test_upgrade_no_config_for_version(self):
+        version_storage_record = await self.storage.find_record(
+            type_filter="acapy_version", tag_query={}
+        )
+        await self.storage.delete_record(version_storage_record)
+        with async_mock.patch.object(
+            test_module,
+            "wallet_config",
+            async_mock.CoroutineMock(
+                return_value=(
+                    self.profile,
+                    async_mock.CoroutineMock(did="public DID", verkey="verkey"),
+                )
+            ),
+        ), async_mock.patch.object(
+            test_module, "_perform_upgrade", async_mock.MagicMock()
+        ) as mock_perform_upgrade:
+            await test_module.upgrade(
+                settings={
+                    "upgrade.config_path": "./aries_cloudagent/commands/default_version_upgrade_config.yml",
+                    "upgrade.from_version": "v0.99.0",
+                }
+            )
+            mock_perform_upgrade.assert_not_called()
+        with self.assertRaises(test_module.StorageNotFoundError):
+            await self.storage.find_record(type_filter="acapy_version", tag_query={})
+
     async def test_upgrade_x_same_version(self):
         version_storage_record = await self.storage.find_record(
             type_filter="acapy_version", tag_query={}
@@ -226,6 +446,12 @@ class TestUpgrade(AsyncTestCase):
                 )
             ),
         ), async_mock.patch.object(
+            ConnRecord,
+            "query",
+            async_mock.CoroutineMock(return_value=[ConnRecord()]),
+        ), async_mock.patch.object(
+            ConnRecord, "save", async_mock.CoroutineMock()
+        ) as mock_save, async_mock.patch.object(
             test_module.yaml,
             "safe_load",
             async_mock.MagicMock(
@@ -249,6 +475,7 @@ class TestUpgrade(AsyncTestCase):
                     }
                 )
             assert "No function specified for" in str(ctx.exception)
+            mock_save.assert_not_called()
 
     async def test_upgrade_x_class_not_found(self):
         with async_mock.patch.object(
@@ -300,11 +527,8 @@ class TestUpgrade(AsyncTestCase):
         ), async_mock.patch.object(
             ConnRecord, "save", async_mock.CoroutineMock()
         ), async_mock.patch.object(
-            asyncio, "get_event_loop", async_mock.MagicMock()
-        ) as mock_get_event_loop:
-            mock_get_event_loop.return_value = async_mock.MagicMock(
-                run_until_complete=async_mock.MagicMock(),
-            )
+            asyncio, "run", async_mock.MagicMock()
+        ) as mock_run:
             test_module.execute(
                 [
                     "--upgrade-config",
@@ -314,6 +538,8 @@ class TestUpgrade(AsyncTestCase):
                     "--force-upgrade",
                 ]
             )
+            mock_run.assert_called_once()
+            mock_run.call_args[0][0].close()
 
     async def test_upgrade_x_invalid_record_type(self):
         with async_mock.patch.object(
@@ -387,8 +613,160 @@ class TestUpgrade(AsyncTestCase):
                 }
             )
 
+    def test_chunks(self):
+        assert list(test_module._chunks(range(5), 2)) == [[0, 1], [2, 3], [4]]
+        assert list(test_module._chunks([], 2)) == []
+
+    async def test_upgrade_resave_batched(self):
+        records = [ConnRecord() for _ in range(test_module.RESAVE_BATCH_SIZE + 1)]
+        with async_mock.patch.object(
+            test_module,
+            "wallet_config",
+            async_mock.CoroutineMock(
+                return_value=(
+                    self.profile,
+                    async_mock.CoroutineMock(did="public DID", verkey="verkey"),
+                )
+            ),
+        ), async_mock.patch.object(
+            ConnRecord,
+            "query",
+            async_mock.CoroutineMock(return_value=records),
+        ), async_mock.patch.object(
+            ConnRecord, "save", async_mock.CoroutineMock()
+        ) as mock_save:
+            await test_module.upgrade(
+                settings={
+                    "upgrade.config_path": "./aries_cloudagent/commands/default_version_upgrade_config.yml",
+                    "upgrade.from_version": "v0.7.2",
+                }
+            )
+            assert mock_save.call_count == len(records)
+
+    def test_load_record_types_cached(self):
+        record_path = "aries_cloudagent.connections.models.conn_record.ConnRecord"
+        test_module._load_record_type.cache_clear()
+        with async_mock.patch.object(
+            test_module.ClassLoader,
+            "load_class",
+            async_mock.MagicMock(return_value=ConnRecord),
+        ) as mock_load_class:
+            assert test_module._load_record_types([record_path]) == {
+                record_path: ConnRecord
+            }
+            assert test_module._load_record_types([record_path]) == {
+                record_path: ConnRecord
+            }
+            mock_load_class.assert_called_once_with(record_path)
+        test_module._load_record_type.cache_clear()
+
+    async def test_resave_records_x_save_cancels_pending(self):
+        records = [ConnRecord() for _ in range(5)]
+        started = []
+        running = []
+        cancelled = []
+
+        async def _save(*args, **kwargs):
+            started.append(True)
+            if len(started) == 1:
+                raise StorageError("save failed")
+            running.append(True)
+            try:
+                await asyncio.Event().wait()
+            except asyncio.CancelledError:
+                cancelled.append(True)
+                raise
+            finally:
+                running.pop()
+
+        with async_mock.patch.object(
+            ConnRecord,
+            "query",
+            async_mock.CoroutineMock(return_value=records),
+        ), async_mock.patch.object(
+            ConnRecord, "save", async_mock.CoroutineMock(side_effect=_save)
+        ):
+            with self.assertRaises(StorageError):
+                await test_module._resave_records(self.session, ConnRecord)
+        assert not running
+        assert len(cancelled) == len(started) - 1
+
+    async def test_resave_record_types_bounded(self):
+        rec_types = [
+            async_mock.MagicMock(__name__=f"Record{i}")
+            for i in range(test_module.RESAVE_CONCURRENCY + 2)
+        ]
+        in_progress = []
+        max_in_progress = []
+        resaved = []
+
+        async def _resave(session, rec_type):
+            in_progress.append(rec_type)
+            max_in_progress.append(len(in_progress))
+            await asyncio.sleep(0)
+            in_progress.remove(rec_type)
+            resaved.append(rec_type)
+
+        with async_mock.patch.object(
+            test_module,
+            "_resave_records",
+            async_mock.CoroutineMock(side_effect=_resave),
+        ):
+            await test_module._resave_record_types(self.profile, rec_types)
+        assert len(resaved) == len(rec_types)
+        assert set(resaved) == set(rec_types)
+        assert max(max_in_progress) <= test_module.RESAVE_CONCURRENCY
+
+    async def test_resave_record_types_x_cancels_others(self):
+        rec_types = [async_mock.MagicMock(__name__=f"Record{i}") for i in range(2)]
+        other_started = asyncio.Event()
+        cancelled = []
+
+        async def _resave(session, rec_type):
+            if rec_type is rec_types[0]:
+                await other_started.wait()
+                raise StorageError("save failed")
+            other_started.set()
+            try:
+                await asyncio.Event().wait()
+            except asyncio.CancelledError:
+                cancelled.append(rec_type)
+                raise
+
+        with async_mock.patch.object(
+            test_module,
+            "_resave_records",
+            async_mock.CoroutineMock(side_effect=_resave),
+        ):
+            with self.assertRaises(StorageError):
+                await test_module._resave_record_types(self.profile, rec_types)
+        assert cancelled == [rec_types[1]]
+
     async def test_get_upgrade_version_list(self):
         assert len(test_module.get_upgrade_version_list(from_version="v0.7.2")) >= 1
+        assert test_module.get_upgrade_version_list(
+            from_version="v0.7.2",
+            sorted_version_list=["v0.6.0", "v0.7.2", "v0.8.1", "v0.10.0"],
+        ) == ["v0.7.2", "v0.8.1", "v0.10.0"]
+        assert test_module._parse_version("v0.10.0") > test_module._parse_version(
+            "v0.9.0"
+        )
+        assert test_module.get_upgrade_version_list(
+            from_version="v0.6.0",
+            sorted_version_list=["v0.6.0", "v0.7.2"],
+        ) == ["v0.6.0", "v0.7.2"]
+        assert (
+            test_module.get_upgrade_version_list(
+                from_version="v0.9.0",
+                sorted_version_list=["v0.6.0", "v0.7.2"],
+            )
+            == []
+        )
+        assert test_module._sort_versions(["v0.10.0", "v0.7.2", "v0.8.1"]) == [
+            "v0.7.2",
+            "v0.8.1",
+            "v0.10.0",
+        ]
 
     async def test_add_version_record(self):
         await test_module.add_version_record(self.profile, "v0.7.4")
@@ -432,6 +810,37 @@ class TestUpgrade(AsyncTestCase):
             test_module.main()
             mock_execute.assert_called_once
 
+    def test_version_upgrade_config(self):
+        with async_mock.patch.object(
+            test_module.yaml,
+            "safe_load",
+            async_mock.MagicMock(
+                return_value={
+                    "v0.7.2": {
+                        "resave_records": {
+                            "base_record_path": ["path.to.Record"],
+                            "base_exch_record_path": ["path.to.ExchRecord"],
+                        },
+                        "update_existing_records": True,
+                    },
+                    "v0.7.1": {"update_existing_records": False},
+                }
+            ),
+        ):
+            config = test_module.VersionUpgradeConfig()
+        assert config.upgrade_configs == {
+            "v0.7.2": {
+                "resave_records": ["path.to.Record", "path.to.ExchRecord"],
+                "update_existing_records": True,
+            },
+            "v0.7.1": {"resave_records": [], "update_existing_records": False},
+        }
+        assert (
+            config.get_callable("update_existing_records")
+            is test_module.update_existing_records
+        )
+        assert config.get_callable("unknown") is None
+
     def test_get_explicit_upgrade_option(self):
         assert not test_module.ExplicitUpgradeOption.get("test")
         assert (
@@ -659,3 +1068,68 @@ class TestUpgrade(AsyncTestCase):
             await test_module.upgrade(profile=self.profile)
             assert mock_logger.warning.call_count == 1
             assert mock_logger.info.call_count == 0
+
+
+@pytest.mark.askar
+class TestUpgradeAskar(AsyncTestCase):
+    async def setUp(self):
+        self.profile = await AskarProfileManager().provision(
+            InjectionContext(),
+            {
+                "name": ":memory:",
+                "key": await AskarProfileManager.generate_store_key(),
+                "key_derivation_method": "RAW",
+            },
+        )
+
+    async def test_resave_records_many(self):
+        count = 1200
+        async with self.profile.session() as session:
+            for i in range(count):
+                await ConnRecord(their_label=f"conn {i}").save(session)
+            conn_ids = {rec.connection_id for rec in await ConnRecord.query(session)}
+
+        with async_mock.patch.object(
+            test_module, "LOGGER", async_mock.MagicMock()
+        ) as mock_logger:
+            async with self.profile.session() as session:
+                # Saves blocked on an open storage scan would hang rather than fail
+                await asyncio.wait_for(
+                    test_module._resave_records(session, ConnRecord), timeout=60
+                )
+            mock_logger.info.assert_called_once_with(
+                "All %d recs of %s successfully re-saved", count, ConnRecord
+            )
+
+        async with self.profile.session() as session:
+            assert {
+                rec.connection_id for rec in await ConnRecord.query(session)
+            } == conn_ids
+
+    async def test_resave_record_types_many(self):
+        count = 1100
+        rec_types = [ConnRecord, V10CredentialExchange, V10PresentationExchange]
+        async with self.profile.session() as session:
+            for rec_type in rec_types:
+                for _ in range(count):
+                    await rec_type().save(session)
+
+        with async_mock.patch.object(
+            test_module, "LOGGER", async_mock.MagicMock()
+        ) as mock_logger:
+            await asyncio.wait_for(
+                test_module._resave_record_types(self.profile, rec_types), timeout=60
+            )
+            mock_logger.info.assert_has_calls(
+                [
+                    async_mock.call(
+                        "All %d recs of %s successfully re-saved", count, rec_type
+                    )
+                    for rec_type in rec_types
+                ],
+                any_order=True,
+            )
+
+        async with self.profile.session() as session:
+            for rec_type in rec_types:
+                assert len(await rec_type.query(session)) == count
@@ -8,9 +8,14 @@ import yaml
 
 from configargparse import ArgumentParser
 from enum import Enum
+from functools import lru_cache
 from packaging import version as package_version
 from typing import (
+    Awaitable,
     Callable,
+    Dict,
+    Iterable,
+    Iterator,
     Sequence,
     Optional,
     List,
@@ -18,6 +23,7 @@ from typing import (
     Mapping,
     Any,
     Tuple,
+    Type,
 )
 
 from ..core.profile import Profile, ProfileSession
@@ -38,6 +44,9 @@ from ..version import __version__, RECORD_TYPE_ACAPY_VERSION
 from . import PROG
 
 DEFAULT_UPGRADE_CONFIG_FILE_NAME = "default_version_upgrade_config.yml"
+RESAVE_BATCH_SIZE = 128
+# Each record type re-saved concurrently holds a session, i.e. one store connection
+RESAVE_CONCURRENCY = 4
 LOGGER = logging.getLogger(__name__)
 
 
@@ -85,17 +94,9 @@ class VersionUpgradeConfig:
             for config_id, provided_config in config_dict.items():
                 recs_list = []
                 tagged_config_dict[config_id] = {}
-                if "resave_records" in provided_config:
-                    if provided_config.get("resave_records").get("base_record_path"):
-                        recs_list = recs_list + provided_config.get(
-                            "resave_records"
-                        ).get("base_record_path")
-                    if provided_config.get("resave_records").get(
-                        "base_exch_record_path"
-                    ):
-                        recs_list = recs_list + provided_config.get(
-                            "resave_records"
-                        ).get("base_exch_record_path")
+                resave_records = provided_config.get("resave_records") or {}
+                recs_list.extend(resave_records.get("base_record_path") or [])
+                recs_list.extend(resave_records.get("base_exch_record_path") or [])
                 tagged_config_dict[config_id]["resave_records"] = recs_list
                 config_key_set = set(provided_config.keys())
                 try:
@@ -120,10 +121,18 @@ class VersionUpgradeConfig:
 
     def get_callable(self, executable: str) -> Optional[Callable]:
         """Return callable function for executable name."""
-        if executable in self.function_map_config:
-            return self.function_map_config.get(executable)
-        else:
-            return None
+        return self.function_map_config.get(executable)
+
+
+@lru_cache(maxsize=None)
+def _parse_version(version: str) -> package_version.Version:
+    """Parse a version string, memoizing the result."""
+    return package_version.parse(version)
+
+
+def _sort_versions(versions: Iterable[str]) -> List[str]:
+    """Sort version strings in ascending order, parsing each only once."""
+    return sorted(versions, key=_parse_version)
 
 
 def init_argument_parser(parser: ArgumentParser):
@@ -138,17 +147,14 @@ def explicit_upgrade_required_check(
     """Check if explicit upgrade is required."""
     to_skip_versions = []
     for version in to_apply_version_list:
-        if "explicit_upgrade" in upgrade_config.get(version):
-            exp_upg_flag = upgrade_config.get(version).get("explicit_upgrade")
-            if (
-                ExplicitUpgradeOption.get(exp_upg_flag)
-                is ExplicitUpgradeOption.ERROR_AND_STOP
-            ):
+        version_config = upgrade_config[version]
+        if "explicit_upgrade" in version_config:
+            exp_upg_option = ExplicitUpgradeOption.get(
+                version_config["explicit_upgrade"]
+            )
+            if exp_upg_option is ExplicitUpgradeOption.ERROR_AND_STOP:
                 return True, [], version
-            elif (
-                ExplicitUpgradeOption.get(exp_upg_flag)
-                is ExplicitUpgradeOption.LOG_AND_PROCEED
-            ):
+            elif exp_upg_option is ExplicitUpgradeOption.LOG_AND_PROCEED:
                 to_skip_versions.append(version)
     return False, to_skip_versions, None
 
@@ -166,15 +172,14 @@ def get_upgrade_version_list(
         version_found_in_config, _ = _get_version_and_name_tags(
             list(tags_found_in_config)
         )
-        sorted_version_list = sorted(
-            version_found_in_config, key=lambda x: package_version.parse(x)
-        )
+        sorted_version_list = _sort_versions(version_found_in_config)
 
-    version_list = []
-    for version in sorted_version_list:
-        if package_version.parse(version) >= package_version.parse(from_version):
-            version_list.append(version)
-    return version_list
+    parsed_from_version = _parse_version(from_version)
+    return [
+        version
+        for version in sorted_version_list
+        if _parse_version(version) >= parsed_from_version
+    ]
 
 
 async def add_version_record(profile: Profile, version: str):
@@ -205,13 +210,109 @@ def _get_version_and_name_tags(tags_found_in_config: List) -> Tuple[List, List]:
     named_tag_found_in_config = []
     for tag in tags_found_in_config:
         try:
-            package_version.parse(tag)
+            _parse_version(tag)
             version_found_in_config.append(tag)
         except package_version.InvalidVersion:
             named_tag_found_in_config.append(tag)
     return version_found_in_config, named_tag_found_in_config
 
 
+@lru_cache(maxsize=256)
+def _load_record_type(record_path: str) -> Type[BaseRecord]:
+    """Resolve and memoize the BaseRecord subclass at record path."""
+    try:
+        rec_type = ClassLoader.load_class(record_path)
+    except ClassNotFoundError as err:
+        raise UpgradeError(f"Unknown Record type {record_path}") from err
+    if not issubclass(rec_type, BaseRecord):
+        raise UpgradeError(f"Only BaseRecord can be resaved, found: {str(rec_type)}")
+    return rec_type
+
+
+def _load_record_types(record_paths: Iterable[str]) -> Dict[str, Type[BaseRecord]]:
+    """Resolve all record paths up front, failing before any record is touched."""
+    return {record_path: _load_record_type(record_path) for record_path in record_paths}
+
+
+def _chunks(iterable: Iterable, size: int) -> Iterator[List]:
+    """Yield successive lists of at most size items from iterable."""
+    chunk = []
+    for item in iterable:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+async def _gather_or_cancel(*aws: Awaitable) -> List:
+    """Run awaitables concurrently, cancelling the rest as soon as one fails."""
+    tasks = [asyncio.ensure_future(aw) for aw in aws]
+    try:
+        return await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        # Wait for the cancellations so nothing outlives the caller's session
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+
+
+async def _resave_records(session: ProfileSession, rec_type: Type[BaseRecord]):
+    """Re-save all records of rec_type in batches using the provided session.
+
+    The records are loaded up front: writing while a storage scan is still open
+    can block on backends such as Askar, where the scan holds its own connection.
+    """
+    all_records = await rec_type.query(session)
+    for chunk in _chunks(all_records, RESAVE_BATCH_SIZE):
+        await _gather_or_cancel(
+            *(
+                record.save(
+                    session,
+                    reason="re-saving record during the upgrade process",
+                )
+                for record in chunk
+            )
+        )
+    if len(all_records) == 0:
+        LOGGER.info("No records of %s found", rec_type)
+    else:
+        LOGGER.info(
+            "All %d recs of %s successfully re-saved", len(all_records), rec_type
+        )
+
+
+async def _resave_record_type(
+    profile: Profile, rec_type: Type[BaseRecord], semaphore: asyncio.Semaphore
+):
+    """Re-save all records of rec_type in a session of its own."""
+    async with semaphore:
+        async with profile.session() as session:
+            await _resave_records(session, rec_type)
+
+
+async def _resave_record_types(profile: Profile, rec_types: Sequence[Type[BaseRecord]]):
+    """Re-save records of all rec_types, bounding the store connections in use.
+
+    Each record type in progress holds a single session, so at most
+    RESAVE_CONCURRENCY types (and store connections) are in use at once.
+    """
+    if not rec_types:
+        return
+    semaphore = asyncio.Semaphore(RESAVE_CONCURRENCY)
+    await _gather_or_cancel(
+        *(_resave_record_type(profile, rec_type, semaphore) for rec_type in rec_types)
+    )
+
+
+async def _run_upgrade_callables(profile: Profile, upgrade_callables: Sequence):
+    """Run the upgrade update functions in order."""
+    for _callable in upgrade_callables:
+        await _callable(profile)
+
+
 def _perform_upgrade(
     upgrade_config: dict,
     resave_record_path_sets: set,
@@ -221,19 +322,11 @@ def _perform_upgrade(
     """Update and return resave record path and executables call sets."""
     LOGGER.info(f"Running upgrade process for {tag}")
     # Step 1 re-saving all BaseRecord and BaseExchangeRecord
-    if "resave_records" in upgrade_config:
-        resave_record_paths = upgrade_config.get("resave_records")
-        for record_path in resave_record_paths:
-            resave_record_path_sets.add(record_path)
+    resave_record_path_sets.update(upgrade_config.get("resave_records") or [])
 
     # Step 2 Update existing records, if required
-    config_key_set = set(upgrade_config.keys())
-    try:
-        config_key_set.remove("resave_records")
-    except KeyError:
-        pass
-    for callable_name in list(config_key_set):
-        if upgrade_config.get(callable_name) is False:
+    for callable_name, enabled in upgrade_config.items():
+        if callable_name == "resave_records" or enabled is False:
             continue
         executables_call_set.add(callable_name)
     return resave_record_path_sets, executables_call_set
@@ -267,11 +360,8 @@ async def upgrade(
         version_found_in_config, named_tag_found_in_config = _get_version_and_name_tags(
             list(tags_found_in_config)
         )
-        sorted_versions_found_in_config = sorted(
-            version_found_in_config, key=lambda x: package_version.parse(x)
-        )
+        sorted_versions_found_in_config = _sort_versions(version_found_in_config)
         upgrade_from_version_storage = None
-        upgrade_from_version_config = None
         upgrade_from_version = None
         async with root_profile.session() as session:
             storage = session.inject(BaseStorage)
@@ -282,21 +372,20 @@ async def upgrade(
                 upgrade_from_version_storage = version_storage_record.value
             except StorageNotFoundError:
                 LOGGER.info("No ACA-Py version found in wallet storage.")
-                version_storage_record = None
 
-            if "upgrade.from_version" in settings:
-                upgrade_from_version_config = settings.get("upgrade.from_version")
-                LOGGER.info(
-                    (
-                        f"Selecting {upgrade_from_version_config} as "
-                        "--from-version from the config."
-                    )
+        upgrade_from_version_config = settings.get("upgrade.from_version")
+        if upgrade_from_version_config:
+            LOGGER.info(
+                (
+                    f"Selecting {upgrade_from_version_config} as "
+                    "--from-version from the config."
                 )
+            )
 
         if upgrade_from_version_storage and upgrade_from_version_config:
             if (
-                package_version.parse(upgrade_from_version_storage)
-                > package_version.parse(upgrade_from_version_config)
+                _parse_version(upgrade_from_version_storage)
+                > _parse_version(upgrade_from_version_config)
             ) and force_upgrade_flag:
                 upgrade_from_version = upgrade_from_version_config
             else:
@@ -362,6 +451,10 @@ async def upgrade(
                         "--force-upgrade"
                     )
                 )
+            elif not upgrade_version_in_config:
+                LOGGER.info(
+                    f"No upgrade config found for versions from {upgrade_from_version}"
+                )
             else:
                 for config_from_version in upgrade_version_in_config:
                     resave_record_path_sets, executables_call_set = _perform_upgrade(
@@ -382,51 +475,30 @@ async def upgrade(
                 )
         if len(resave_record_path_sets) >= 1 or len(executables_call_set) >= 1:
             to_update_flag = True
-        for record_path in resave_record_path_sets:
-            try:
-                rec_type = ClassLoader.load_class(record_path)
-            except ClassNotFoundError as err:
-                raise UpgradeError(f"Unknown Record type {record_path}") from err
-            if not issubclass(rec_type, BaseRecord):
-                raise UpgradeError(
-                    f"Only BaseRecord can be resaved, found: {str(rec_type)}"
-                )
-            async with root_profile.session() as session:
-                all_records = await rec_type.query(session)
-                for record in all_records:
-                    await record.save(
-                        session,
-                        reason="re-saving record during the upgrade process",
-                    )
-                if len(all_records) == 0:
-                    LOGGER.info(f"No records of {str(rec_type)} found")
-                else:
-                    LOGGER.info(f"All recs of {str(rec_type)} successfully re-saved")
+        # Resolve everything the upgrade needs before touching any records
+        resave_record_types = _load_record_types(resave_record_path_sets)
+        upgrade_callables = []
         for callable_name in executables_call_set:
             _callable = version_upgrade_config_inst.get_callable(callable_name)
             if not _callable:
                 raise UpgradeError(f"No function specified for {callable_name}")
-            await _callable(root_profile)
+            if _callable is update_existing_records:
+                # Default no-op, nothing to run
+                continue
+            upgrade_callables.append(_callable)
+        resave_rec_types = list(resave_record_types.values())
+        if settings.get("upgrade.pipeline"):
+            await _gather_or_cancel(
+                _resave_record_types(root_profile, resave_rec_types),
+                _run_upgrade_callables(root_profile, upgrade_callables),
+            )
+        else:
+            await _resave_record_types(root_profile, resave_rec_types)
+            await _run_upgrade_callables(root_profile, upgrade_callables)
 
-        # Update storage version
+        # Update storage version, re-reading the record in the same short session
         if to_update_flag:
-            async with root_profile.session() as session:
-                storage = session.inject(BaseStorage)
-                if not version_storage_record:
-                    await storage.add_record(
-                        StorageRecord(
-                            RECORD_TYPE_ACAPY_VERSION,
-                            upgrade_to_version,
-                        )
-                    )
-                else:
-                    await storage.update_record(
-                        version_storage_record, upgrade_to_version, {}
-                    )
-                LOGGER.info(
-                    f"{RECORD_TYPE_ACAPY_VERSION} storage record "
-                    f"set to {upgrade_to_version}"
-                )
+            await add_version_record(root_profile, upgrade_to_version)
         if not profile:
             await root_profile.close()
     except BaseError as e:
@@ -436,6 +508,8 @@ async def upgrade(
 async def update_existing_records(profile: Profile):
     """Update existing records.
 
+    This is a no-op placeholder; upgrade() skips it rather than awaiting it.
+
     Args:
         profile: Root profile
 
@@ -512,8 +586,7 @@ def execute(argv: Sequence[str] = None):
     args = parser.parse_args(argv)
     settings = get_settings(args)
     common_config(settings)
-    loop = asyncio.get_event_loop()
-    loop.run_until_complete(upgrade(settings=settings))
+    asyncio.run(upgrade(settings=settings))
 
 
 def main():
@@ -527,4 +600,5 @@ UPGRADE_EXISTING_RECORDS_FUNCTION_MAPPING = {
     "fix_issue_rev_reg_records": fix_issue_rev_reg_records,
 }
 
+
 main()
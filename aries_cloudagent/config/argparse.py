@@ -2148,6 +2148,18 @@ class UpgradeGroup(ArgumentGroup):
             help=("Runs upgrade steps associated with tags provided in the config"),
         )
 
+        parser.add_argument(
+            "--pipeline-upgrade",
+            action="store_true",
+            env_var="ACAPY_UPGRADE_PIPELINE",
+            help=(
+                "Run the upgrade update functions concurrently with re-saving "
+                "records, instead of after all records are re-saved. Only use "
+                "this if the configured update functions do not depend on the "
+                "re-saved records."
+            ),
+        )
+
     def get_settings(self, args: Namespace) -> dict:
         """Extract ACA-Py upgrade process settings."""
         settings = {}
@@ -2161,4 +2173,6 @@ class UpgradeGroup(ArgumentGroup):
             settings["upgrade.named_tags"] = (
                 list(args.named_tag) if args.named_tag else []
             )
+        if args.pipeline_upgrade:
+            settings["upgrade.pipeline"] = args.pipeline_upgrade
         return settings
@@ -139,6 +139,7 @@ class TestArgParse(AsyncTestCase):
                 "--from-version",
                 "v0.7.2",
                 "--force-upgrade",
+                "--pipeline-upgrade",
             ]
         )
 
@@ -147,6 +148,7 @@ class TestArgParse(AsyncTestCase):
             == "./aries_cloudagent/config/tests/test-acapy-upgrade-config.yml"
         )
         assert result.force_upgrade is True
+        assert result.pipeline_upgrade is True
 
         settings = group.get_settings(result)
 
@@ -154,6 +156,7 @@ class TestArgParse(AsyncTestCase):
             settings.get("upgrade.config_path")
             == "./aries_cloudagent/config/tests/test-acapy-upgrade-config.yml"
         )
+        assert settings.get("upgrade.pipeline") is True
 
     async def test_outbound_is_required(self):
         """Test that either -ot or -oq are required"""
@@ -5,14 +5,28 @@ import logging
 import sys
 import uuid
 from datetime import datetime
-from typing import Any, Mapping, Optional, Sequence, Type, TypeVar, Union
+from typing import (
+    Any,
+    AsyncIterator,
+    Mapping,
+    Optional,
+    Sequence,
+    Type,
+    TypeVar,
+    Union,
+)
 
 from marshmallow import fields
 
 from ...cache.base import BaseCache
 from ...config.settings import BaseSettings
 from ...core.profile import ProfileSession
-from ...storage.base import BaseStorage, StorageDuplicateError, StorageNotFoundError
+from ...storage.base import (
+    BaseStorage,
+    BaseStorageSearch,
+    StorageDuplicateError,
+    StorageNotFoundError,
+)
 from ...storage.record import StorageRecord
 from ..util import datetime_to_str, time_now
 from ..valid import INDY_ISO8601_DATETIME_EXAMPLE, INDY_ISO8601_DATETIME_VALIDATE
@@ -278,6 +292,33 @@ class BaseRecord(BaseModel):
             )
         return found
 
+    @classmethod
+    def _from_storage_post_filtered(
+        cls: Type[RecordType],
+        record: StorageRecord,
+        post_filter_positive: dict = None,
+        post_filter_negative: dict = None,
+        alt: bool = False,
+    ) -> Optional[RecordType]:
+        """Load a stored record if its value matches the post filters, else None."""
+        vals = json.loads(record.value)
+        if match_post_filter(
+            vals,
+            post_filter_positive,
+            positive=True,
+            alt=alt,
+        ) and match_post_filter(
+            vals,
+            post_filter_negative,
+            positive=False,
+            alt=alt,
+        ):
+            try:
+                return cls.from_storage(record.id, vals)
+            except BaseModelError as err:
+                raise BaseModelError(f"{err}, for record id {record.id}")
+        return None
+
     @classmethod
     async def query(
         cls: Type[RecordType],
@@ -307,24 +348,65 @@ class BaseRecord(BaseModel):
         )
         result = []
         for record in rows:
-            vals = json.loads(record.value)
-            if match_post_filter(
-                vals,
-                post_filter_positive,
-                positive=True,
-                alt=alt,
-            ) and match_post_filter(
-                vals,
-                post_filter_negative,
-                positive=False,
-                alt=alt,
-            ):
-                try:
-                    result.append(cls.from_storage(record.id, vals))
-                except BaseModelError as err:
-                    raise BaseModelError(f"{err}, for record id {record.id}")
+            found = cls._from_storage_post_filtered(
+                record, post_filter_positive, post_filter_negative, alt
+            )
+            if found is not None:
+                result.append(found)
         return result
 
+    @classmethod
+    async def query_iter(
+        cls: Type[RecordType],
+        session: ProfileSession,
+        tag_filter: dict = None,
+        *,
+        page_size: int = None,
+        post_filter_positive: dict = None,
+        post_filter_negative: dict = None,
+        alt: bool = False,
+    ) -> AsyncIterator[RecordType]:
+        """Iterate over stored records, fetching them from storage page by page.
+
+        Depending on the storage backend, the underlying search may hold its own
+        store connection until iteration completes. On Askar, writing through the
+        session while iterating can block, so use `query` to update records.
+
+        Args:
+            session: The profile session to use
+            tag_filter: An optional dictionary of tag filter clauses
+            page_size: Number of records to fetch from storage at a time
+            post_filter_positive: Additional value filters to apply matching positively
+            post_filter_negative: Additional value filters to apply matching negatively
+            alt: set to match any (positive=True) value or miss all (positive=False)
+                values in post_filter
+        """
+
+        storage = session.inject(BaseStorage)
+        if isinstance(storage, BaseStorageSearch):
+            search = storage
+        else:
+            search = session.inject(BaseStorageSearch)
+        scan = search.search_records(
+            cls.RECORD_TYPE,
+            cls.prefix_tag_filter(tag_filter),
+            page_size,
+            options={"retrieveTags": False},
+        )
+        try:
+            while True:
+                rows = await scan.fetch()
+                if not rows:
+                    break
+                for record in rows:
+                    found = cls._from_storage_post_filtered(
+                        record, post_filter_positive, post_filter_negative, alt
+                    )
+                    if found is not None:
+                        yield found
+        finally:
+            await scan.close()
+
     async def save(
         self,
         session: ProfileSession,
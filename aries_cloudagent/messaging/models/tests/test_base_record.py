@@ -201,6 +201,38 @@ class TestBaseRecord(AsyncTestCase):
             with self.assertRaises(BaseModelError):
                 await BaseRecordImpl.query(session, tag_filter)
 
+    async def test_query_iter(self):
+        session = InMemoryProfile.test_session()
+        records = [ARecordImpl(a=str(i), b="two", code="red") for i in range(5)]
+        for record in records:
+            await record.save(session)
+        await ARecordImpl(a="5", b="two", code="blue").save(session)
+
+        result = [
+            rec
+            async for rec in ARecordImpl.query_iter(
+                session, {"code": "red"}, page_size=2
+            )
+        ]
+        assert sorted(rec.a for rec in result) == [rec.a for rec in records]
+
+        result = [
+            rec
+            async for rec in ARecordImpl.query_iter(
+                session, {"code": "red"}, post_filter_positive={"a": "3"}
+            )
+        ]
+        assert len(result) == 1 and result[0].a == "3"
+
+        with async_mock.patch.object(
+            ARecordImpl,
+            "from_storage",
+            async_mock.MagicMock(side_effect=BaseModelError),
+        ):
+            with self.assertRaises(BaseModelError):
+                async for _ in ARecordImpl.query_iter(session, {"code": "blue"}):
+                    pass
+
     async def test_query_post_filter(self):
         session = InMemoryProfile.test_session()
         mock_storage = async_mock.MagicMock(BaseStorage, autospec=True)
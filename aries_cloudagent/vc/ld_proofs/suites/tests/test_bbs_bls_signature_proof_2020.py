@@ -1,3 +1,5 @@
+import asyncio
+
 from asynctest import TestCase, mock as async_mock
 import pytest
 
@@ -36,17 +38,18 @@ from ..bbs_bls_signature_proof_2020 import BbsBlsSignatureProof2020
 class TestBbsBlsSignatureProof2020(TestCase):
     test_seed = "testseed000000000000000000000001"
 
-    async def setUp(self):
-        self.profile = InMemoryProfile.test_profile()
-        self.wallet = InMemoryWallet(self.profile)
-        self.key = await self.wallet.create_signing_key(
-            key_type=BLS12381G2, seed=self.test_seed
+    @classmethod
+    def setUpClass(cls):
+        cls.profile = InMemoryProfile.test_profile()
+        cls.wallet = InMemoryWallet(cls.profile)
+        cls.key = asyncio.run(
+            cls.wallet.create_signing_key(key_type=BLS12381G2, seed=cls.test_seed)
         )
-        self.verification_method = DIDKey.from_public_key_b58(
-            self.key.verkey, BLS12381G2
+        cls.verification_method = DIDKey.from_public_key_b58(
+            cls.key.verkey, BLS12381G2
         ).key_id
 
-        self.key_pair = WalletKeyPair(profile=self.profile, key_type=BLS12381G2)
+        cls.key_pair = WalletKeyPair(profile=cls.profile, key_type=BLS12381G2)
 
     async def test_derive_ld_proofs(self):
         derived = await derive(
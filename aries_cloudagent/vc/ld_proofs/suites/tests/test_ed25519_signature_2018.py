@@ -1,3 +1,5 @@
+import asyncio
+
 from asynctest import TestCase
 
 from aries_cloudagent.wallet.key_type import ED25519
@@ -26,22 +28,23 @@ from ..ed25519_signature_2018 import Ed25519Signature2018
 class TestEd25519Signature2018(TestCase):
     test_seed = "testseed000000000000000000000001"
 
-    async def setUp(self):
-        self.profile = InMemoryProfile.test_profile()
-        self.wallet = InMemoryWallet(self.profile)
-        self.key = await self.wallet.create_signing_key(
-            key_type=ED25519, seed=self.test_seed
+    @classmethod
+    def setUpClass(cls):
+        cls.profile = InMemoryProfile.test_profile()
+        cls.wallet = InMemoryWallet(cls.profile)
+        cls.key = asyncio.run(
+            cls.wallet.create_signing_key(key_type=ED25519, seed=cls.test_seed)
         )
-        self.verification_method = DIDKey.from_public_key_b58(
-            self.key.verkey, ED25519
+        cls.verification_method = DIDKey.from_public_key_b58(
+            cls.key.verkey, ED25519
         ).key_id
 
-        self.sign_key_pair = WalletKeyPair(
-            profile=self.profile,
+        cls.sign_key_pair = WalletKeyPair(
+            profile=cls.profile,
             key_type=ED25519,
-            public_key_base58=self.key.verkey,
+            public_key_base58=cls.key.verkey,
         )
-        self.verify_key_pair = WalletKeyPair(profile=self.profile, key_type=ED25519)
+        cls.verify_key_pair = WalletKeyPair(profile=cls.profile, key_type=ED25519)
 
     async def test_sign_ld_proofs(self):
         signed = await sign(
@@ -1,3 +1,5 @@
+import asyncio
+
 from asynctest import TestCase
 
 from aries_cloudagent.wallet.key_type import ED25519
@@ -21,30 +23,36 @@ from .....wallet.in_memory import InMemoryWallet
 class TestEd25519Signature2020(TestCase):
     test_seed = "testseed000000000000000000000001"
 
-    async def setUp(self):
-        self.profile = InMemoryProfile.test_profile()
-        self.wallet = InMemoryWallet(self.profile)
-        self.key = await self.wallet.create_signing_key(
-            key_type=ED25519, seed=self.test_seed
+    @classmethod
+    def setUpClass(cls):
+        # None of the tests mutate the wallet, so the key is created only once
+        cls.profile = InMemoryProfile.test_profile()
+        cls.wallet = InMemoryWallet(cls.profile)
+        cls.key = asyncio.run(
+            cls.wallet.create_signing_key(key_type=ED25519, seed=cls.test_seed)
         )
-        self.verification_method = DIDKey.from_public_key_b58(
-            self.key.verkey, ED25519
+        cls.verification_method = DIDKey.from_public_key_b58(
+            cls.key.verkey, ED25519
         ).key_id
 
-        self.sign_key_pair = WalletKeyPair(
-            profile=self.profile,
+        cls.sign_key_pair = WalletKeyPair(
+            profile=cls.profile,
             key_type=ED25519,
-            public_key_base58=self.key.verkey,
+            public_key_base58=cls.key.verkey,
+        )
+        cls.verify_key_pair = WalletKeyPair(profile=cls.profile, key_type=ED25519)
+
+        # Suites keep no per-call state, so they are shared across tests too
+        cls.sign_suite = Ed25519Signature2020(
+            key_pair=cls.sign_key_pair,
+            verification_method=cls.verification_method,
         )
-        self.verify_key_pair = WalletKeyPair(profile=self.profile, key_type=ED25519)
+        cls.verify_suite = Ed25519Signature2020(key_pair=cls.verify_key_pair)
 
     async def test_sign_ld_proofs(self):
         signed = await sign(
             document=TEST_LD_DOCUMENT,
-            suite=Ed25519Signature2020(
-                key_pair=self.sign_key_pair,
-                verification_method=self.verification_method,
-            ),
+            suite=self.sign_suite,
             document_loader=custom_document_loader,
             purpose=AssertionProofPurpose(),
         )
@@ -54,7 +62,7 @@ class TestEd25519Signature2020(TestCase):
     async def test_verify_ld_proofs(self):
         result = await verify(
             document=TEST_LD_DOCUMENT_SIGNED_ED25519_2020,
-            suites=[Ed25519Signature2020(key_pair=self.verify_key_pair)],
+            suites=[self.verify_suite],
             document_loader=custom_document_loader,
             purpose=AssertionProofPurpose(),
         )
@@ -65,7 +73,7 @@ class TestEd25519Signature2020(TestCase):
     async def test_verify_ld_proofs_not_verified_bad_signature(self):
         result = await verify(
             document=TEST_LD_DOCUMENT_BAD_SIGNED_ED25519_2020,
-            suites=[Ed25519Signature2020(key_pair=self.verify_key_pair)],
+            suites=[self.verify_suite],
             document_loader=custom_document_loader,
             purpose=AssertionProofPurpose(),
         )
@@ -80,7 +88,7 @@ class TestEd25519Signature2020(TestCase):
         }
         result = await verify(
             document=MODIFIED_DOCUMENT,
-            suites=[Ed25519Signature2020(key_pair=self.verify_key_pair)],
+            suites=[self.verify_suite],
             document_loader=custom_document_loader,
             purpose=AssertionProofPurpose(),
         )
@@ -95,7 +103,7 @@ class TestEd25519Signature2020(TestCase):
         }
         result = await verify(
             document=MODIFIED_DOCUMENT,
-            suites=[Ed25519Signature2020(key_pair=self.verify_key_pair)],
+            suites=[self.verify_suite],
             document_loader=custom_document_loader,
             purpose=AssertionProofPurpose(),
         )
@@ -106,10 +114,7 @@ class TestEd25519Signature2020(TestCase):
     async def test_sign_vc(self):
         signed = await sign(
             document=TEST_VC_DOCUMENT,
-            suite=Ed25519Signature2020(
-                key_pair=self.sign_key_pair,
-                verification_method=self.verification_method,
-            ),
+            suite=self.sign_suite,
             document_loader=custom_document_loader,
             purpose=AssertionProofPurpose(),
         )
@@ -119,7 +124,7 @@ class TestEd25519Signature2020(TestCase):
     async def test_verify_vc(self):
         result = await verify(
             document=TEST_VC_DOCUMENT_SIGNED_ED25519_2020,
-            suites=[Ed25519Signature2020(key_pair=self.verify_key_pair)],
+            suites=[self.verify_suite],
             document_loader=custom_document_loader,
             purpose=AssertionProofPurpose(),
         )